@@ -5,7 +5,109 @@
 
 import requests
 import os
-from datetime import datetime
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from src.utils.disk_cache import DiskCache
+from src.utils.ttl_cache import TTLCache
+
+# Contract verification rarely changes; keep results for a day.
+# Unverified results expire sooner so newly verified contracts flip quickly.
+_VERIFIED_TTL = 86400  # seconds
+_UNVERIFIED_TTL = 3600  # seconds
+
+# What a failed lookup can raise: transport errors, bad JSON, odd payload shapes
+_FETCH_ERRORS = (requests.RequestException, ValueError, TypeError, KeyError, IndexError, AttributeError)
+
+# Multicall3 is deployed at the same address on most EVM chains
+_MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+_AGGREGATE3 = "82ad56cb"  # aggregate3((address,bool,bytes)[])
+
+# ERC-20 / Ownable view selectors used for token facts
+_SEL_SYMBOL = "95d89b41"
+_SEL_DECIMALS = "313ce567"
+_SEL_OWNER = "8da5cb5b"
+
+
+def _word(n: int) -> str:
+    return format(n, "064x")
+
+
+def _encode_aggregate3(calls) -> str:
+    # ABI: selector | offset(array) | len | tuple offsets | tuples
+    # tuple = target | allowFailure=true | offset(bytes)=0x60 | len | data (padded)
+    tuples = []
+    for target, calldata in calls:
+        data = calldata[2:] if calldata.startswith("0x") else calldata
+        padded = data + "0" * (-len(data) % 64)
+        tuples.append(
+            _word(int(target, 16)) + _word(1) + _word(0x60) + _word(len(data) // 2) + padded
+        )
+
+    offsets, pos = [], 32 * len(tuples)
+    for t in tuples:
+        offsets.append(_word(pos))
+        pos += len(t) // 2
+
+    return "0x" + _AGGREGATE3 + _word(0x20) + _word(len(tuples)) + "".join(offsets) + "".join(tuples)
+
+
+def _decode_aggregate3(result: str) -> list:
+    # returns (bool success, bytes returnData)[] -> list of bytes (None when a call failed)
+    raw = bytes.fromhex(result[2:] if result.startswith("0x") else result)
+
+    def word(at):
+        return int.from_bytes(raw[at:at + 32], "big")
+
+    arr = word(0)
+    n = word(arr)
+    out = []
+    for i in range(n):
+        t = arr + 32 + word(arr + 32 + 32 * i)
+        ok = word(t) != 0
+        data_at = t + word(t + 32)
+        length = word(data_at)
+        out.append(raw[data_at + 32:data_at + 32 + length] if ok else None)
+    return out
+
+
+def _decode_string(data) -> str:
+    # ABI string, or bytes32 for older tokens (e.g. MKR)
+    if not data:
+        return ""
+    if len(data) >= 64:
+        length = int.from_bytes(data[32:64], "big")
+        if 64 + length <= len(data):
+            return data[64:64 + length].decode("utf-8", "replace")
+    return data[:32].rstrip(b"\x00").decode("utf-8", "replace")
+
+
+# Shared by every client for overlapping independent lookups
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ctrad-eth")
+
+# Per-address lookups shared by every client: (lookup, address) -> value
+_lookup_cache = TTLCache(maxsize=10_000, ttl=60)
+
+# Verified status persisted across restarts (opened on first use)
+_VERIFIED_DB = os.path.join(os.getenv("CTRAD_CACHE_DIR", "~/.ctrad"), "contract_cache.sqlite")
+_verified_disk = None
+
+
+def _verified_store():
+    global _verified_disk
+    if _verified_disk is None:
+        try:
+            _verified_disk = DiskCache(_VERIFIED_DB)
+        except (OSError, sqlite3.Error):
+            # unwritable location: memory cache only
+            _verified_disk = False
+    return _verified_disk or None
 
 
 class EthereumClient:
@@ -17,6 +119,10 @@ class EthereumClient:
         self.api_key = api_key or os.getenv("ETHERSCAN_API_KEY")
         self.base_url = "https://api.etherscan.io/api"
 
+        # One pooled session for all calls. No HTTP-level cache: Etherscan sends
+        # rate-limit errors as 200s, and the per-lookup caches only keep parsed successes
+        self.session = requests.Session()
+
     # -------------------------------------------------
     # WALLET INFO
     # -------------------------------------------------
@@ -24,6 +130,10 @@ class EthereumClient:
         """
         Returns total transaction count for a wallet.
         """
+        cached = _lookup_cache.get(("tx_count", address))
+        if cached is not None:
+            return cached
+
         params = {
             "module": "proxy",
             "action": "eth_getTransactionCount",
@@ -33,16 +143,22 @@ class EthereumClient:
         }
 
         try:
-            r = requests.get(self.base_url, params=params, timeout=10)
-            data = r.json()
-            return int(data.get("result", "0x0"), 16)
-        except Exception:
+            r = self.session.get(self.base_url, params=params, timeout=10)
+            data = _json_loads(r.content)
+            count = int(data.get("result", "0x0"), 16)
+            _lookup_cache.set(("tx_count", address), count)
+            return count
+        except _FETCH_ERRORS:
             return 0
 
     def get_wallet_age_days(self, address: str) -> int:
         """
         Approximate wallet age using first transaction.
         """
+        cached = _lookup_cache.get(("age_days", address))
+        if cached is not None:
+            return cached
+
         params = {
             "module": "account",
             "action": "txlist",
@@ -56,21 +172,34 @@ class EthereumClient:
         }
 
         try:
-            r = requests.get(self.base_url, params=params, timeout=10)
-            txs = r.json().get("result", [])
+            r = self.session.get(self.base_url, params=params, timeout=10)
+            txs = _json_loads(r.content).get("result", [])
             if not txs:
-                return 0
-
-            first_ts = int(txs[0]["timeStamp"])
-            days = (datetime.utcnow().timestamp() - first_ts) / 86400
-            return int(days)
-        except Exception:
+                days = 0
+            else:
+                first_ts = int(txs[0]["timeStamp"])
+                days = int((datetime.now(timezone.utc).timestamp() - first_ts) / 86400)
+            _lookup_cache.set(("age_days", address), days)
+            return days
+        except _FETCH_ERRORS:
             return 0
 
     # -------------------------------------------------
     # CONTRACT INFO
     # -------------------------------------------------
     def is_contract_verified(self, contract_addr: str) -> bool:
+        cached = _lookup_cache.get(("verified", contract_addr))
+        if cached is not None:
+            return cached
+
+        disk = _verified_store()
+        if disk is not None:
+            cached = disk.get(contract_addr)
+            if cached is not None:
+                ttl = _VERIFIED_TTL if cached else _UNVERIFIED_TTL
+                _lookup_cache.set(("verified", contract_addr), cached, ttl=ttl)
+                return cached
+
         params = {
             "module": "contract",
             "action": "getsourcecode",
@@ -79,8 +208,83 @@ class EthereumClient:
         }
 
         try:
-            r = requests.get(self.base_url, params=params, timeout=10)
-            result = r.json().get("result", [{}])[0]
-            return bool(result.get("SourceCode"))
-        except Exception:
+            r = self.session.get(self.base_url, params=params, timeout=10)
+            result = _json_loads(r.content).get("result", [{}])[0]
+            verified = bool(result.get("SourceCode"))
+            ttl = _VERIFIED_TTL if verified else _UNVERIFIED_TTL
+            _lookup_cache.set(("verified", contract_addr), verified, ttl=ttl)
+            if disk is not None:
+                disk.set(contract_addr, verified, ttl)
+            return verified
+        except _FETCH_ERRORS:
             return False
+
+    # -------------------------------------------------
+    # BATCHED VIEW CALLS
+    # -------------------------------------------------
+    def eth_call(self, to: str, data: str) -> str:
+        params = {
+            "module": "proxy",
+            "action": "eth_call",
+            "to": to,
+            "data": data,
+            "tag": "latest",
+            "apikey": self.api_key
+        }
+        r = self.session.get(self.base_url, params=params, timeout=10)
+        result = _json_loads(r.content).get("result")
+        if not isinstance(result, str) or not result.startswith("0x"):
+            raise ValueError(f"eth_call failed: {result}")
+        return result
+
+    def multicall3(self, calls) -> list:
+        """
+        Runs [(target, calldata), ...] as one Multicall3 aggregate3 eth_call.
+        Returns raw return bytes per call (None for a failed call). Falls back
+        to one eth_call per entry when Multicall3 isn't available on the chain.
+        """
+        if not calls:
+            return []
+
+        try:
+            results = _decode_aggregate3(self.eth_call(_MULTICALL3, _encode_aggregate3(calls)))
+            # no contract at _MULTICALL3 answers "0x", which decodes to []
+            if len(results) == len(calls):
+                return results
+        except _FETCH_ERRORS:
+            pass
+
+        out = []
+        for target, calldata in calls:
+            try:
+                out.append(bytes.fromhex(self.eth_call(target, calldata)[2:]))
+            except _FETCH_ERRORS:
+                out.append(None)
+        return out
+
+    def get_token_facts(self, contract_addr: str) -> dict:
+        """
+        symbol / decimals / owner of a token contract in one round trip.
+        """
+        symbol, decimals, owner = self.multicall3([
+            (contract_addr, "0x" + _SEL_SYMBOL),
+            (contract_addr, "0x" + _SEL_DECIMALS),
+            (contract_addr, "0x" + _SEL_OWNER),
+        ])
+        return {
+            "symbol": _decode_string(symbol),
+            "decimals": int.from_bytes(decimals[:32], "big") if decimals else None,
+            "owner": "0x" + owner[12:32].hex() if owner and len(owner) >= 32 else "",
+        }
+
+    # -------------------------------------------------
+    # CONCURRENT LOOKUPS
+    # -------------------------------------------------
+    def get_wallet_facts_batch(self, address: str) -> tuple:
+        """
+        (tx_count, age_days) for a wallet in one call, both lookups in flight
+        at once: the age lookup runs on the shared pool, the count on this thread.
+        No event loop involved, so it behaves the same inside a running loop.
+        """
+        age_days = _POOL.submit(self.get_wallet_age_days, address)
+        return self.get_wallet_tx_count(address), age_days.result()
@@ -0,0 +1,27 @@
+# ============================================
+# CTRAD — Shared Risk Configuration
+# One immutable copy of the rule constants used by the scorer,
+# the training labels and the UI bands.
+# ============================================
+
+# Known scam destinations (lowercase)
+BLACKLIST = frozenset({
+    "0xscamdead00000000000000000000000000000000",
+    "0xphishdead000000000000000000000000000000",
+})
+
+# Lowercase destination prefixes treated as blacklisted (tuple for str.startswith)
+BLACKLIST_PREFIXES = ("0x000",)
+
+# Token symbols that trip the rule-based check (uppercase)
+RISKY_TOKENS = frozenset({"UNKNOWN", "SCAM", "FAKE"})
+
+# Tabular heuristic: a "< bound" ladder over amount_usd
+AMOUNT_BUCKETS = (500, 5_000, 25_000, 100_000)
+AMOUNT_SCORES = (0.05, 0.15, 0.35, 0.6, 0.9)
+
+# Aggregation weights: rules, sequence, tabular, graph, contract
+AGG_WEIGHTS = (0.30, 0.20, 0.20, 0.15, 0.15)
+
+# Lower bounds (0-100 score) of the WARN / BLOCK bands
+RISK_LABEL_CUTOFFS = (60, 85)
@@ -2,6 +2,12 @@
 # CTRAD — Smart Contract Risk Engine
 # ============================================
 
+from functools import lru_cache
+
+# Well-known symbols commonly cloned by scam tokens
+_POPULAR_SYMBOLS = frozenset({"USDT", "ETH", "BTC"})
+
+
 class ContractRiskEngine:
     """
     Detects malicious token contract patterns.
@@ -10,11 +16,12 @@ class ContractRiskEngine:
 
     def __init__(self):
         # Demo blacklist (replace with real API later)
-        self.blacklisted_contracts = {
+        # frozenset: immutable and hashable, so it can be part of the score cache key
+        self.blacklisted_contracts = frozenset({
             "0xdeadbeef",
             "0xbadhoneypot",
             "0xscamtoken"
-        }
+        })
 
     def score(self, contract_addr: str, tx: dict) -> tuple:
         """
@@ -25,25 +32,33 @@ class ContractRiskEngine:
         if not contract_addr:
             return 0.0, ["No contract address provided"]
 
-        contract_addr = contract_addr.lower()
+        score, reasons = self._score_cached(
+            contract_addr.lower(),
+            tx.get("token_symbol", "").upper(),
+            tx.get("sell_tax", 0),
+            tx.get("buy_tax", 0),
+            tx.get("contract_owner", ""),
+            self.blacklisted_contracts
+        )
+        return score, list(reasons)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score_cached(contract_addr, symbol, sell_tax, buy_tax, owner, frozen_blacklist):
         score = 0.0
         reasons = []
 
         # 1️⃣ Blacklist check
-        if contract_addr in self.blacklisted_contracts:
+        if contract_addr in frozen_blacklist:
             score += 0.9
             reasons.append("Contract is blacklisted")
 
         # 2️⃣ Suspicious token naming
-        symbol = tx.get("token_symbol", "").upper()
-        if symbol in {"USDT", "ETH", "BTC"}:
+        if symbol in _POPULAR_SYMBOLS:
             score += 0.4
             reasons.append("Popular token symbol but unknown contract")
 
         # 3️⃣ Honeypot heuristic (simplified)
-        sell_tax = tx.get("sell_tax", 0)
-        buy_tax = tx.get("buy_tax", 0)
-
         if sell_tax and sell_tax > 20:
             score += 0.6
             reasons.append("Very high sell tax (possible honeypot)")
@@ -53,9 +68,8 @@ class ContractRiskEngine:
             reasons.append("High buy tax")
 
         # 4️⃣ Ownership control
-        owner = tx.get("contract_owner", "")
         if owner and owner != "renounced":
             score += 0.3
             reasons.append("Contract ownership not renounced")
 
-        return min(score, 1.0), reasons
+        return min(score, 1.0), tuple(reasons)
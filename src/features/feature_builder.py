@@ -1,33 +1,106 @@
 # src/features/feature_builder.py
-import datetime
+import math
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class TxFeatures:
+    """Pre-transaction features for a single tx (fixed column order)."""
+    amount_usd: float
+    log_amount: float
+    from_age_days: int
+    to_age_days: int
+    sender_tx_count_7d: int
+    recipient_tx_count_7d: int
+    is_contract_to: bool
+
+
+FEATURE_NAMES = tuple(f.name for f in fields(TxFeatures))
+_COL = {name: i for i, name in enumerate(FEATURE_NAMES)}
 
 
 class FeatureBuilder:
-"""Lightweight FeatureBuilder for pre-transaction context.
-This computes only features available before broadcasting a tx.
-Replace / extend with real historical queries in production.
-"""
-def __init__(self):
-# load any global stats or cached DB here (placeholder)
-pass
-
-
-def transform_one(self, tx: dict) -> dict:
-# tx: dict with keys chain, from_addr, to_addr, amount, amount_usd, timestamp
-feat = {}
-# Basic
-feat['amount_usd'] = float(tx.get('amount_usd', 0.0) or 0.0)
-feat['log_amount'] = float((feat['amount_usd'] + 1.0))
-# Mock address history features (in real app query DB or node)
-# For demo create simple heuristics
-feat['from_age_days'] = 400 # assume older address
-feat['to_age_days'] = 1 if tx['to_addr'].endswith('dead') else 120
-feat['sender_tx_count_7d'] = 5
-feat['recipient_tx_count_7d'] = 1
-feat['is_contract_to'] = tx.get('token_contract', '') != ''
-return feat
-
-
-def fit(self, records):
-# Optionally implement if you need global statistics
-return self
+    """Lightweight FeatureBuilder for pre-transaction context.
+    This computes only features available before broadcasting a tx.
+    Replace / extend with real historical queries in production.
+    """
+    def __init__(self):
+        # load any global stats or cached DB here (placeholder)
+        pass
+
+
+    def transform_one(self, tx: dict) -> TxFeatures:
+        # tx: dict with keys chain, from_addr, to_addr, amount, amount_usd, timestamp
+        amount_usd = float(tx.get('amount_usd', 0.0) or 0.0)
+        # Mock address history features (in real app query DB or node)
+        # For demo create simple heuristics
+        return TxFeatures(
+            amount_usd=amount_usd,
+            log_amount=math.log1p(amount_usd),
+            from_age_days=400,  # assume older address
+            to_age_days=1 if (tx.get('to_addr') or '').endswith('dead') else 120,
+            sender_tx_count_7d=5,
+            recipient_tx_count_7d=1,
+            is_contract_to=tx.get('token_contract', '') != '',
+        )
+
+
+    def transform_batch(self, txs) -> np.ndarray:
+        # Columnar (N, F) float32 matrix in FEATURE_NAMES order, ready for model.predict(X)
+        n = len(txs)
+        X = np.empty((n, len(FEATURE_NAMES)), dtype=np.float32)
+
+        amounts = np.fromiter(
+            (float(tx.get('amount_usd', 0.0) or 0.0) for tx in txs), dtype=np.float32, count=n
+        )
+        X[:, _COL['amount_usd']] = amounts
+        X[:, _COL['log_amount']] = np.log1p(amounts)
+        X[:, _COL['from_age_days']] = 400
+        X[:, _COL['to_age_days']] = np.fromiter(
+            (1 if (tx.get('to_addr') or '').endswith('dead') else 120 for tx in txs),
+            dtype=np.float32, count=n
+        )
+        X[:, _COL['sender_tx_count_7d']] = 5
+        X[:, _COL['recipient_tx_count_7d']] = 1
+        X[:, _COL['is_contract_to']] = np.fromiter(
+            (tx.get('token_contract', '') != '' for tx in txs), dtype=np.float32, count=n
+        )
+        return X
+
+
+    def fit(self, records):
+        # Optionally implement if you need global statistics
+        return self
+
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        # DataFrame in -> feature DataFrame out (same index); used by training.
+        # Whole-column ops only; to_addr / token_contract are optional columns
+        n = len(df)
+        X = np.empty((n, len(FEATURE_NAMES)), dtype=np.float32)
+
+        amounts = (df['amount_usd'].fillna(0.0).to_numpy(dtype=np.float32)
+                   if 'amount_usd' in df.columns else np.zeros(n, dtype=np.float32))
+        X[:, _COL['amount_usd']] = amounts
+        X[:, _COL['log_amount']] = np.log1p(amounts)
+        X[:, _COL['from_age_days']] = 400
+        to_addr = df.get('to_addr')
+        X[:, _COL['to_age_days']] = (
+            np.where(to_addr.astype('string').str.endswith('dead', na=False).to_numpy(bool), 1, 120)
+            if to_addr is not None else 120
+        )
+        X[:, _COL['sender_tx_count_7d']] = 5
+        X[:, _COL['recipient_tx_count_7d']] = 1
+        token_contract = df.get('token_contract')
+        X[:, _COL['is_contract_to']] = (
+            token_contract.astype('string').ne('').fillna(True).to_numpy(bool)
+            if token_contract is not None else 0
+        )
+        return pd.DataFrame(X, columns=FEATURE_NAMES, index=df.index)
+
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
@@ -2,6 +2,34 @@
 # CTRAD — Graph-Based Wallet Reputation
 # ======================================
 
+import numpy as np
+
+
+def _pack_prefixes(addrs: np.ndarray, length: int):
+    """
+    Packs the first `length` (<= 6) chars of each address into one uint64
+    (7 bits per ASCII char). Returns (keys, valid_mask).
+    """
+    codes = addrs.astype("<U6").view(np.uint32).reshape(-1, 6)[:, :length]
+    valid = (codes < 128).all(axis=1)
+
+    keys = np.zeros(codes.shape[0], dtype=np.uint64)
+    for i in range(length):
+        keys = (keys << np.uint64(7)) | codes[:, i].astype(np.uint64)
+    return keys, valid
+
+
+def _lookup(sorted_keys: np.ndarray, risks: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Vectorized dict.get(query, 0.0) against a sorted key array.
+    """
+    if sorted_keys.size == 0:
+        return np.zeros(query.shape[0])
+    idx = np.searchsorted(sorted_keys, query)
+    idx = np.minimum(idx, sorted_keys.size - 1)
+    return np.where(sorted_keys[idx] == query, risks[idx], 0.0)
+
+
 class GraphReputation:
     """
     Simple graph reputation model using:
@@ -36,6 +64,45 @@ class GraphReputation:
             }
         }
 
+        # Normalize once: lowercase, immutable address sets
+        for cluster in self.scam_clusters.values():
+            cluster["addresses"] = frozenset(a.lower() for a in cluster["addresses"])
+
+        # Precomputed prefix lookups: prefix -> max weighted cluster risk
+        # (full address = 1.0, 6 chars = 0.70, 4 chars = 0.45, 2 chars = 0.20)
+        self._by_len = {"full": {}, 6: {}, 4: {}, 2: {}}
+        weights = {"full": 1.0, 6: 0.7, 4: 0.45, 2: 0.20}
+
+        # Highest-risk clusters first
+        self._clusters_sorted = sorted(
+            self.scam_clusters.values(), key=lambda c: -c["base_risk"]
+        )
+
+        for cluster in self._clusters_sorted:
+            for scam_addr in cluster["addresses"]:
+                for length, weight in weights.items():
+                    key = scam_addr if length == "full" else scam_addr[:length]
+                    table = self._by_len[length]
+                    table[key] = max(table.get(key, 0.0), cluster["base_risk"] * weight)
+
+        # Tiers ordered by the highest risk they can yield, so lookups can
+        # stop once nothing left could raise the score
+        self._tiers = sorted(
+            ((length, table, max(table.values(), default=0.0))
+             for length, table in self._by_len.items()),
+            key=lambda t: -t[2]
+        )
+
+        # Same tables as sorted arrays for score_batch (risks pre-rounded
+        # so results match score() exactly)
+        self._batch_tables = {}
+        for length, table in self._by_len.items():
+            prefixes = np.array(list(table), dtype=str)
+            risks = np.array([round(v, 3) for v in table.values()], dtype=np.float64)
+            keys = prefixes if length == "full" else _pack_prefixes(prefixes, length)[0]
+            order = np.argsort(keys)
+            self._batch_tables[length] = (keys[order], risks[order])
+
     def compute_distance(self, addr: str) -> float:
         """
         Computes how close the wallet is to known scam clusters.
@@ -50,23 +117,11 @@ class GraphReputation:
 
         max_risk = 0.0
 
-        for cluster in self.scam_clusters.values():
-            for scam_addr in cluster["addresses"]:
-
-                scam_addr = scam_addr.lower()
-
-                if addr == scam_addr:
-                    max_risk = max(max_risk, cluster["base_risk"])
-
-                # Prefix similarity (cheap graph approximation)
-                if addr[:6] == scam_addr[:6]:
-                    max_risk = max(max_risk, cluster["base_risk"] * 0.7)
-
-                if addr[:4] == scam_addr[:4]:
-                    max_risk = max(max_risk, cluster["base_risk"] * 0.45)
-
-                if addr[:2] == scam_addr[:2]:
-                    max_risk = max(max_risk, cluster["base_risk"] * 0.20)
+        for length, table, ceiling in self._tiers:
+            if max_risk >= ceiling:
+                break
+            key = addr if length == "full" else addr[:length]
+            max_risk = max(max_risk, table.get(key, 0.0))
 
         return round(max_risk, 3)
 
@@ -76,3 +131,22 @@ class GraphReputation:
         Output: value 0–1
         """
         return self.compute_distance(addr)
+
+    def score_batch(self, addrs) -> np.ndarray:
+        """
+        Vectorized score() for many addresses at once.
+        Output: float array of values 0–1, same order as input
+        """
+        addrs = np.char.lower(np.asarray(addrs, dtype=str))
+        if addrs.size == 0:
+            return np.zeros(0)
+
+        keys, risks = self._batch_tables["full"]
+        tiers = [_lookup(keys, risks, addrs)]
+
+        for length in (6, 4, 2):
+            keys, risks = self._batch_tables[length]
+            query, valid = _pack_prefixes(addrs, length)
+            tiers.append(np.where(valid, _lookup(keys, risks, query), 0.0))
+
+        return np.maximum.reduce(tiers)
@@ -3,9 +3,163 @@
 # Industry-Grade (Steps 1–7)
 # =====================================================
 
+import asyncio
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
 from src.graph.graph_reputation import GraphReputation
 from src.contract.contract_risk import ContractRiskEngine
 from src.chain.eth_client import EthereumClient
+from src.config import (
+    AGG_WEIGHTS,
+    AMOUNT_BUCKETS,
+    AMOUNT_SCORES,
+    BLACKLIST_PREFIXES,
+    RISK_LABEL_CUTOFFS,
+    RISKY_TOKENS,
+)
+from src.utils.jit import NUMBA_AVAILABLE, njit
+# Kernels here are compiled per process (no cache=True): "src/scoring " is
+# loaded by file path under caller-chosen module names, and Numba's disk
+# cache records the module name, so one loader's cache breaks every other
+
+# Shared by all scorers; wallet lookups overlap with the in-process steps
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ctrad-score")
+
+# Rule table: (reason, points, predicate(amount, TOKEN, to_addr_lower)).
+# Order matters — the fused kernel and batch path add points in this order.
+_RULES = (
+    ("Very high transaction amount", 0.7, lambda amount, token, to_addr: amount >= 100_000),
+    ("Suspicious token symbol", 0.6, lambda amount, token, to_addr: token in RISKY_TOKENS),
+    ("Blacklisted destination address pattern", 0.8, lambda amount, token, to_addr: to_addr.startswith(BLACKLIST_PREFIXES)),
+)
+_RULE_REASONS = tuple(r[0] for r in _RULES)
+_RULE_POINTS = tuple(r[1] for r in _RULES)
+_RULE_WEIGHTS = np.array(_RULE_POINTS, dtype=np.float64)
+
+
+def _rule_flags(tx: dict) -> tuple:
+    amount = float(tx.get("amount_usd", 0))
+    token = tx.get("token_symbol", "").upper()
+    to_addr = tx.get("to_addr", "").lower()
+    return tuple(bool(pred(amount, token, to_addr)) for _, _, pred in _RULES)
+
+
+def _join_reasons(flags):
+    reasons = [r for hit, r in zip(flags, _RULE_REASONS) if hit]
+    return "; ".join(reasons) if reasons else "No major rule violations"
+
+
+# Every hit combination is known up front: flags tuple -> (capped points, reason text)
+_RULE_OUTCOMES = {
+    flags: (min(sum((p for hit, p in zip(flags, _RULE_POINTS) if hit), 0.0), 1.0), _join_reasons(flags))
+    for flags in product((False, True), repeat=len(_RULES))
+}
+
+
+def _rule_reason(flags):
+    return _RULE_OUTCOMES[flags][1]
+
+
+# Score cut-offs for MEDIUM_RISK / HIGH_RISK
+_WARN_CUT, _BLOCK_CUT = RISK_LABEL_CUTOFFS
+
+# Aggregation weights: rules, sequence, tabular, graph, contract
+_AGG_WEIGHTS = np.array(AGG_WEIGHTS, dtype=np.float64)
+
+# Amount buckets for the tabular heuristic; side="right" keeps the "< bound" cut-offs
+_AMT_BINS = np.array(AMOUNT_BUCKETS, dtype=np.float64)
+_AMT_SCORES = np.array(AMOUNT_SCORES, dtype=np.float64)
+# Plain-float copies for the scalar path (bisect beats a NumPy call on one value)
+_AMT_BINS_T = tuple(_AMT_BINS.tolist())
+_AMT_SCORES_T = tuple(_AMT_SCORES.tolist())
+
+
+def _round3(v: float) -> float:
+    # Half-up to 3 decimals with integer arithmetic; component scores are
+    # non-negative and already sit on (or within float noise of) 3-decimal values,
+    # so this matches round(v, 3) for them at a fraction of the cost
+    return int(v * 1000 + 0.5) / 1000
+
+
+@njit(nogil=True)
+def _score_kernel(amount, big_amount, bad_token, zero_prefix, tx_count, wallet_age,
+                  graph, contract, weights, rule_points, amt_bins, amt_scores):
+    # Fused rules / tabular / sequence / aggregate; same operation order as the
+    # per-step methods so results stay bit-identical (no fastmath).
+    # Config tables come in as arguments: globals would be frozen into the
+    # on-disk cache, which doesn't notice edits to src/config.py
+    rules = 0.0
+    if big_amount:
+        rules += rule_points[0]
+    if bad_token:
+        rules += rule_points[1]
+    if zero_prefix:
+        rules += rule_points[2]
+    rules = min(rules, 1.0)
+
+    idx = 0
+    while idx < amt_bins.shape[0] and amount >= amt_bins[idx]:
+        idx += 1
+    tab = float(amt_scores[idx])
+
+    seq = 0.0
+    if tx_count < 5:
+        seq += 0.4
+    if wallet_age < 7:
+        seq += 0.5
+    seq = min(seq, 1.0)
+
+    score = 0.0
+    score += weights[0] * rules
+    score += weights[1] * seq
+    score += weights[2] * tab
+    score += weights[3] * graph
+    score += weights[4] * contract
+    return rules, seq, tab, float(score)
+
+
+@njit(nogil=True)
+def _score_batch_kernel(amount, hits, tx_count, wallet_age, graph, contract, weights,
+                        rule_points, amt_bins, amt_scores):
+    # Row-wise _score_kernel: identical arithmetic to the scalar path, one native loop
+    n = amount.shape[0]
+    rules = np.empty(n)
+    seq = np.empty(n)
+    tab = np.empty(n)
+    raw = np.empty(n)
+    for i in range(n):
+        r, q, t, sc = _score_kernel(
+            amount[i], hits[0, i], hits[1, i], hits[2, i],
+            tx_count[i], wallet_age[i], graph[i], contract[i], weights,
+            rule_points, amt_bins, amt_scores
+        )
+        rules[i] = r
+        seq[i] = q
+        tab[i] = t
+        raw[i] = sc
+    return rules, seq, tab, raw
+
+
+# Process-wide engines: built on first use, reused by every scorer
+@lru_cache(maxsize=1)
+def _get_graph() -> GraphReputation:
+    return GraphReputation()
+
+
+@lru_cache(maxsize=1)
+def _get_contract_engine() -> ContractRiskEngine:
+    return ContractRiskEngine()
+
+
+@lru_cache(maxsize=1)
+def _get_eth_client() -> EthereumClient:
+    return EthereumClient()
 
 
 class CTRADScorer:
@@ -15,10 +169,16 @@ class CTRADScorer:
     smart-contract checks, and LIVE blockchain data.
     """
 
-    def __init__(self):
-        self.graph_model = GraphReputation()
-        self.contract_engine = ContractRiskEngine()
-        self.eth_client = EthereumClient()
+    def __init__(self, shared: bool = True):
+        # shared=False gives this scorer its own engines and HTTP session
+        if shared:
+            self.graph_model = _get_graph()
+            self.contract_engine = _get_contract_engine()
+            self.eth_client = _get_eth_client()
+        else:
+            self.graph_model = GraphReputation()
+            self.contract_engine = ContractRiskEngine()
+            self.eth_client = EthereumClient()
 
     # -------------------------------------------------
     # MAIN ENTRY POINT
@@ -33,28 +193,34 @@ class CTRADScorer:
         # ================================
         from_addr = tx.get("from_addr", "")
 
-        wallet_tx_count = self.eth_client.get_wallet_tx_count(from_addr)
-        wallet_age_days = self.eth_client.get_wallet_age_days(from_addr)
+        # network-bound: runs on the pool while the local steps execute
+        facts_future = _POOL.submit(self.eth_client.get_wallet_facts_batch, from_addr)
+
+        local = self._local_scores(tx, from_addr)
 
         # enrich tx dict
-        tx["wallet_tx_count"] = wallet_tx_count
-        tx["wallet_age_days"] = wallet_age_days
+        tx["wallet_tx_count"], tx["wallet_age_days"] = facts_future.result()
 
-        # ================================
-        # STEP 1 — RULE-BASED CHECKS
-        # ================================
-        rules_score, rules_reason = self.rule_based_checks(tx)
+        return self._finalize(tx, *local)
 
-        # ================================
-        # STEP 2 — TABULAR HEURISTICS
-        # ================================
-        tab_score = self.tabular_score(tx)
+    async def ascore_pre_transaction(self, tx: dict, features: dict = None) -> dict:
+        """
+        Same as score_pre_transaction, for callers already inside an event loop.
+        """
+        from_addr = tx.get("from_addr", "")
 
-        # ================================
-        # STEP 3 — SEQUENCE / BEHAVIOR
-        # ================================
-        seq_score = self.sequence_score(tx)
+        # submitted immediately, so the lookups overlap the local steps
+        facts_future = asyncio.get_running_loop().run_in_executor(
+            _POOL, self.eth_client.get_wallet_facts_batch, from_addr
+        )
+
+        local = self._local_scores(tx, from_addr)
+
+        tx["wallet_tx_count"], tx["wallet_age_days"] = await facts_future
 
+        return self._finalize(tx, *local)
+
+    def _local_scores(self, tx: dict, from_addr: str) -> tuple:
         # ================================
         # STEP 5 — GRAPH REPUTATION
         # ================================
@@ -68,16 +234,20 @@ class CTRADScorer:
             contract_addr, tx
         )
 
+        return graph_score, contract_score, contract_reasons, _rule_flags(tx)
+
+    def _finalize(self, tx: dict, graph_score, contract_score, contract_reasons, flags) -> dict:
         # ================================
-        # FINAL AGGREGATION
+        # STEPS 1-3 + FINAL AGGREGATION (one fused kernel call)
         # ================================
-        final_score = self.aggregate_scores(
-            rules_score,
-            seq_score,
-            tab_score,
-            graph_score,
-            contract_score
+        rules_score, seq_score, tab_score, score = _score_kernel(
+            float(tx.get("amount_usd", 0)), *flags,
+            float(tx["wallet_tx_count"]), float(tx["wallet_age_days"]),
+            float(graph_score), float(contract_score), _AGG_WEIGHTS,
+            _RULE_WEIGHTS, _AMT_BINS, _AMT_SCORES
         )
+        rules_reason = _rule_reason(flags)
+        final_score = round(score * 100, 2)
 
         label, action = self.map_label_action(final_score)
 
@@ -91,58 +261,137 @@ class CTRADScorer:
                 else rules_reason
             ),
             "component_scores": {
-                "rules": round(rules_score, 3),
-                "tabular": round(tab_score, 3),
-                "sequence": round(seq_score, 3),
-                "graph": round(graph_score, 3),
-                "contract": round(contract_score, 3)
+                "rules": _round3(rules_score),
+                "tabular": _round3(tab_score),
+                "sequence": _round3(seq_score),
+                "graph": _round3(graph_score),
+                "contract": _round3(contract_score)
             },
-            "top_features": self.top_features(tx, tab_score)
+            "top_features": self.top_features(tx, tab_score, seq_score)
         }
 
     # -------------------------------------------------
-    # STEP 1 — RULE-BASED DETECTION
+    # BATCH ENTRY POINT
     # -------------------------------------------------
-    def rule_based_checks(self, tx: dict):
-        score = 0.0
-        reasons = []
-
-        amount = float(tx.get("amount_usd", 0))
-        token = tx.get("token_symbol", "").upper()
-        to_addr = tx.get("to_addr", "").lower()
-
-        if amount >= 100_000:
-            score += 0.7
-            reasons.append("Very high transaction amount")
-
-        if token in {"UNKNOWN", "SCAM", "FAKE"}:
-            score += 0.6
-            reasons.append("Suspicious token symbol")
+    def score_pre_transaction_batch(self, txs_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Columnar scoring for many transactions at once.
+        txs_df: one row per tx (same keys as score_pre_transaction).
+        If wallet_tx_count / wallet_age_days columns are missing they are
+        fetched once per unique sender.
+        Returns a DataFrame of component scores, risk_score, label, action.
+        """
+        n = len(txs_df)
+
+        def col(name, default):
+            if name in txs_df.columns:
+                return txs_df[name].fillna(default)
+            return pd.Series([default] * n, index=txs_df.index)
+
+        amount = col("amount_usd", 0).astype(float).to_numpy()
+        tokens = col("token_symbol", "").astype(str).str.upper()
+        to_addr = col("to_addr", "").astype(str).str.lower()
+        from_addr = col("from_addr", "").astype(str)
+
+        # LIVE BLOCKCHAIN FEATURES (once per unique sender)
+        if {"wallet_tx_count", "wallet_age_days"}.issubset(txs_df.columns):
+            tx_count = txs_df["wallet_tx_count"].fillna(0).to_numpy()
+            wallet_age = txs_df["wallet_age_days"].fillna(0).to_numpy()
+        else:
+            senders = from_addr.unique()
+            facts = dict(zip(senders, _POOL.map(self.eth_client.get_wallet_facts_batch, senders)))
+            # one pass over the rows; split the (tx_count, age_days) pairs afterwards
+            pairs = np.array([facts[a] for a in from_addr.tolist()], dtype=np.float64).reshape(n, 2)
+            tx_count, wallet_age = pairs[:, 0], pairs[:, 1]
+
+        # STEP 1 — RULE HITS (one mask row per rule, in rule order)
+        hits = np.vstack([
+            amount >= 100_000,
+            np.isin(tokens.to_numpy(), list(RISKY_TOKENS)),
+            to_addr.str.startswith(BLACKLIST_PREFIXES).to_numpy(dtype=bool),
+        ])
+
+        # STEP 5 — GRAPH
+        graph = self.graph_model.score_batch(from_addr.to_numpy())
+
+        # STEP 6 — CONTRACT (cached per distinct contract inputs)
+        # Only the inputs the engine reads, with the scalar path's defaults for
+        # missing keys (to_dict would hand it NaN for keys absent from some rows)
+        contract_inputs = pd.DataFrame({
+            "contract_addr": col("contract_addr", "").astype(str),
+            "token_symbol": tokens,
+            "sell_tax": col("sell_tax", 0),
+            "buy_tax": col("buy_tax", 0),
+            "contract_owner": col("contract_owner", "").astype(str),
+        })
+        contract = np.array([
+            self.contract_engine.score(tx["contract_addr"], tx)[0]
+            for tx in contract_inputs.to_dict("records")
+        ], dtype=np.float64)
+
+        tx_count = np.asarray(tx_count, dtype=np.float64)
+        wallet_age = np.asarray(wallet_age, dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            # STEPS 1-3 + AGGREGATION: the scalar kernel per row, compiled into one loop
+            rules, seq, tab, raw = _score_batch_kernel(
+                amount, hits, tx_count, wallet_age, graph, contract, _AGG_WEIGHTS,
+                _RULE_WEIGHTS, _AMT_BINS, _AMT_SCORES
+            )
+        else:
+            # STEP 1 — RULES
+            rules = np.minimum(np.add.reduce(hits * _RULE_WEIGHTS[:, None], axis=0), 1.0)
+
+            # STEP 2 — TABULAR
+            tab = _AMT_SCORES[np.searchsorted(_AMT_BINS, amount, side="right")]
+
+            # STEP 3 — SEQUENCE
+            seq = np.minimum(0.4 * (tx_count < 5) + 0.5 * (wallet_age < 7), 1.0)
+
+            # (N, 5) components in _AGG_WEIGHTS order, accumulated column by column:
+            # a BLAS matmul reorders the adds and flips some .xx5 roundings vs scalar
+            components = np.column_stack([rules, seq, tab, graph, contract])
+            raw = np.zeros(n, dtype=np.float64)
+            for j, w in enumerate(_AGG_WEIGHTS):
+                raw += w * components[:, j]
+
+        # FINAL AGGREGATION (Python round() so values match the scalar path)
+        raw = raw * 100
+        final = np.array([round(v, 2) for v in raw.tolist()], dtype=np.float64)
+
+        return pd.DataFrame({
+            "rules": np.round(rules, 3),
+            "tabular": np.round(tab, 3),
+            "sequence": np.round(seq, 3),
+            "graph": np.round(graph, 3),
+            "contract": np.round(contract, 3),
+            "risk_score": final,
+            "risk_label": np.select(
+                [final >= _BLOCK_CUT, final >= _WARN_CUT], ["HIGH_RISK", "MEDIUM_RISK"], "SAFE"
+            ),
+            "action": np.select([final >= _BLOCK_CUT, final >= _WARN_CUT], ["block", "warn"], "allow"),
+        }, index=txs_df.index)
 
-        if to_addr.startswith("0x000"):
-            score += 0.8
-            reasons.append("Blacklisted destination address pattern")
+    def score_batch(self, txs: list) -> np.ndarray:
+        """
+        Risk scores (0-100) for a list of tx dicts, computed columnar.
+        """
+        if not txs:
+            return np.empty(0, dtype=np.float64)
+        return self.score_pre_transaction_batch(pd.DataFrame.from_records(txs))["risk_score"].to_numpy()
 
-        return min(score, 1.0), (
-            "; ".join(reasons) if reasons else "No major rule violations"
-        )
+    # -------------------------------------------------
+    # STEP 1 — RULE-BASED DETECTION
+    # -------------------------------------------------
+    def rule_based_checks(self, tx: dict):
+        return _RULE_OUTCOMES[_rule_flags(tx)]
 
     # -------------------------------------------------
     # STEP 2 — TABULAR HEURISTICS
     # -------------------------------------------------
     def tabular_score(self, tx: dict):
         amount = float(tx.get("amount_usd", 0))
-
-        if amount < 500:
-            return 0.05
-        elif amount < 5_000:
-            return 0.15
-        elif amount < 25_000:
-            return 0.35
-        elif amount < 100_000:
-            return 0.6
-        else:
-            return 0.9
+        return _AMT_SCORES_T[bisect_right(_AMT_BINS_T, amount)]
 
     # -------------------------------------------------
     # STEP 3 — SEQUENCE / WALLET BEHAVIOR (LIVE)
@@ -165,12 +414,13 @@ class CTRADScorer:
     # FINAL AGGREGATION
     # -------------------------------------------------
     def aggregate_scores(self, rules, seq, tab, graph, contract):
+        w_rules, w_seq, w_tab, w_graph, w_contract = AGG_WEIGHTS
         score = (
-            0.30 * rules +
-            0.20 * seq +
-            0.20 * tab +
-            0.15 * graph +
-            0.15 * contract
+            w_rules * rules +
+            w_seq * seq +
+            w_tab * tab +
+            w_graph * graph +
+            w_contract * contract
         )
         return round(score * 100, 2)
 
@@ -178,9 +428,9 @@ class CTRADScorer:
     # LABEL & ACTION
     # -------------------------------------------------
     def map_label_action(self, score: float):
-        if score >= 85:
+        if score >= _BLOCK_CUT:
             return "HIGH_RISK", "block"
-        elif score >= 60:
+        elif score >= _WARN_CUT:
             return "MEDIUM_RISK", "warn"
         else:
             return "SAFE", "allow"
@@ -188,16 +438,16 @@ class CTRADScorer:
     # -------------------------------------------------
     # FEATURE EXPLANATION
     # -------------------------------------------------
-    def top_features(self, tx: dict, tab_score: float):
+    def top_features(self, tx: dict, tab_score: float, seq_score: float):
         return [
             {
                 "feature": "amount_usd",
                 "value": float(tx.get("amount_usd", 0)),
-                "impact": round(tab_score, 3)
+                "impact": _round3(tab_score)
             },
             {
                 "feature": "wallet_tx_count",
                 "value": tx.get("wallet_tx_count", 0),
-                "impact": round(self.sequence_score(tx), 3)
+                "impact": _round3(seq_score)
             }
         ]
@@ -1,3 +1,31 @@
+import numpy as np
+
+from src.utils.jit import NUMBA_AVAILABLE, njit
+# No cache=True: this file is loaded by path under varying module names (see scorer.py)
+
+
+@njit(fastmath=True, nogil=True)
+def _seq_kernel(hist, cur):
+    n = hist.shape[0]
+
+    s = 0.0
+    for i in range(n):
+        s += hist[i]
+    avg = s / n
+
+    v = 0.0
+    for i in range(n):
+        d = hist[i] - avg
+        v += d * d
+
+    std = (v / n) ** 0.5
+    if std < 1e-6:
+        std = 1e-6
+
+    z = abs(cur - avg) / std
+    return min(z / 5, 1.0)
+
+
 class SequenceModel:
     """
     Lightweight mock of a sequence anomaly model.
@@ -18,13 +46,15 @@ class SequenceModel:
         if not history_amounts or len(history_amounts) < 3:
             return 0.10  # small risk
 
-        avg = sum(history_amounts) / len(history_amounts)
-        diffs = [(x - avg) ** 2 for x in history_amounts]
-        std = (sum(diffs) / len(history_amounts)) ** 0.5
+        if NUMBA_AVAILABLE:
+            hist = np.ascontiguousarray(history_amounts, dtype=np.float64)
+            return float(_seq_kernel(hist, float(current_amount)))
+
+        a = np.asarray(history_amounts, dtype=np.float64)
+        avg = a.mean()
 
         # If std is extremely small, avoid divide by zero
-        if std < 1e-6:
-            std = 1e-6
+        std = max(a.std(), 1e-6)
 
         # z-score
         z = abs(current_amount - avg) / std
@@ -32,4 +62,4 @@ class SequenceModel:
         # map z-score → risk (0–1)
         risk = min(z / 5, 1.0)
 
-        return risk
+        return float(risk)
@@ -1,8 +1,23 @@
+import re
+
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import MinMaxScaler
 
+# Token volatility stub (upgrade later)
+_TOKEN_VOLATILITY = {
+    "ETH": 0.2,
+    "USDT": 0.05,
+    "USDC": 0.05,
+    "BNB": 0.18,
+    "DOGE": 0.45,
+    "SHIB": 0.55,
+}
+
+# Case-insensitive "0xabc" prefix, matched in place (no lowercased copy)
+_ADDR_FLAG_RE = re.compile(r"0[xX][aA][bB][cC]")
+
 
 class TabularModel:
     """
@@ -54,26 +69,43 @@ class TabularModel:
         X_scaled = self.scaler.fit_transform(X)
         self.model.fit(X_scaled, y)
 
+        # MinMax normalization constants, applied inline at predict time
+        # (same X * scale_ + min_ arithmetic as scaler.transform, minus its validation)
+        self._scale = self.scaler.scale_.copy()
+        self._min = self.scaler.min_.copy()
+
     def predict(self, amount_usd: float, token_symbol: str, from_addr: str):
         """
         Return risk probability (0–1).
         """
 
-        # Token volatility stub (upgrade later)
-        token_volatility = {
-            "ETH": 0.2,
-            "USDT": 0.05,
-            "USDC": 0.05,
-            "BNB": 0.18,
-            "DOGE": 0.45,
-            "SHIB": 0.55,
-        }.get(token_symbol.upper(), 0.30)
+        token_volatility = _TOKEN_VOLATILITY.get(token_symbol.upper(), 0.30)
 
         # Address pattern flag
-        addr_flag = 1 if from_addr.lower().startswith("0xabc") else 0
+        addr_flag = 1 if _ADDR_FLAG_RE.match(from_addr) else 0
 
         X = np.array([[amount_usd, token_volatility, addr_flag]])
-        X_scaled = self.scaler.transform(X)
+        X_scaled = X * self._scale + self._min
 
         prob = self.model.predict_proba(X_scaled)[0][1]
         return float(prob)
+
+    def predict_batch(self, amount_usd, token_symbol, from_addr) -> np.ndarray:
+        """
+        Vectorized predict: one scale + one predict_proba for N transactions.
+        Returns risk probabilities (0–1) as an array.
+        """
+        amount = np.asarray(amount_usd, dtype=np.float64)
+        token_volatility = (
+            pd.Series(token_symbol, dtype=str).str.upper()
+            .map(_TOKEN_VOLATILITY).fillna(0.30).to_numpy(dtype=np.float64)
+        )
+        addr_flag = (
+            pd.Series(from_addr, dtype=str)
+            .str.match(_ADDR_FLAG_RE).to_numpy(dtype=np.float64)
+        )
+
+        X = np.column_stack([amount, token_volatility, addr_flag])
+        X_scaled = X * self._scale + self._min
+
+        return self.model.predict_proba(X_scaled)[:, 1]
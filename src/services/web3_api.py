@@ -1,38 +1,108 @@
 # src/services/web3_api.py
+import asyncio
 import os
-import time
+import re
 import requests
-from typing import Optional, Dict, Any
+import sqlite3
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from threading import Lock
+from typing import Optional, Dict, Any, List
 
-# Simple in-memory TTL cache to reduce API calls
-_cache: Dict[str, tuple] = {}
+from src.utils.disk_cache import DiskCache
+from src.utils.ttl_cache import TTLCache
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Streamlit is optional here (secrets lookup only); resolve it once at import
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+# Bounded in-memory TTL caches to reduce API calls (thread-safe).
+# Lifetimes follow how fast the data changes: tx lists / balances (default),
+# prices (short), token & contract metadata (effectively immutable).
 _CACHE_TTL = 60  # seconds; tune as needed for dev
+_cache = TTLCache(maxsize=10_000, ttl=_CACHE_TTL)
+_price_cache = TTLCache(maxsize=10_000, ttl=30)
+_static_cache = TTLCache(maxsize=10_000, ttl=3600)
+# Failed responses, so a bad key/address isn't re-probed on every call.
+# Only failures that will repeat get the full TTL; transport errors, 429s and
+# 5xx that outlived the retries are held just long enough to absorb a burst.
+_negative_cache = TTLCache(maxsize=2048, ttl=300)
+_TRANSIENT_FAILURE_TTL = 5  # seconds
 
-def _get_cache(key: str):
-    rec = _cache.get(key)
-    if not rec:
-        return None
-    ts, val = rec
-    if time.time() - ts > _CACHE_TTL:
-        _cache.pop(key, None)
-        return None
-    return val
+# Static metadata also persisted across restarts (opened on first use)
+_STATIC_DB = os.path.join(os.getenv("CTRAD_CACHE_DIR", "~/.ctrad"), "moralis_cache.sqlite")
+_STATIC_DISK_TTL = 86400  # seconds
+_static_disk = None
 
-def _set_cache(key: str, val: Any):
-    _cache[key] = (time.time(), val)
 
+def _static_store():
+    global _static_disk
+    if _static_disk is None:
+        try:
+            _static_disk = DiskCache(_STATIC_DB)
+        except (OSError, sqlite3.Error):
+            # unwritable location: memory cache only
+            _static_disk = False
+    return _static_disk or None
 
-def get_moralis_api_key() -> Optional[str]:
+def _get_cache(key: str, store: TTLCache = _cache):
+    return store.get(key)
+
+def _set_cache(key: str, val: Any, store: TTLCache = _cache):
+    store.set(key, val)
+
+# get_address_transactions limits are rounded up to these so callers share cache slots
+_LIMIT_BUCKETS = (10, 50, 100)
+
+# One pooled session: keep-alive connections (no TLS handshake per call) and
+# backoff retries on rate limits / transient server errors
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_SESSION.headers["Accept"] = "application/json"
+
+# Requests currently on the wire: cache_key -> Future shared by duplicate callers
+_inflight: Dict[str, Future] = {}
+_inflight_lock = Lock()
+
+
+def _resolve_moralis_key() -> Optional[str]:
     """Prefer Streamlit secrets, then environment variable."""
-    try:
-        import streamlit as st
-        if "MORALIS_API_KEY" in st.secrets:
-            return st.secrets["MORALIS_API_KEY"]
-    except Exception:
-        pass
+    if st is not None:
+        try:
+            if "MORALIS_API_KEY" in st.secrets:
+                return st.secrets["MORALIS_API_KEY"]
+        except Exception:
+            # no secrets.toml configured
+            pass
     return os.environ.get("MORALIS_API_KEY")
 
 
+def get_moralis_api_key() -> Optional[str]:
+    """Resolved key, cached at module level; looked up again only while unset."""
+    global _MORALIS_KEY
+    if not _MORALIS_KEY:
+        _MORALIS_KEY = _resolve_moralis_key()
+        if _MORALIS_KEY:
+            _SESSION.headers["X-API-Key"] = _MORALIS_KEY
+    return _MORALIS_KEY
+
+
+_MORALIS_KEY: Optional[str] = None
+get_moralis_api_key()
+
+
 # Mapping friendly chain names to Moralis chain param
 # Moralis accepts things like 'eth', 'polygon', 'bsc', 'avalanche', 'fantom' etc.
 CHAIN_MAP = {
@@ -47,41 +117,102 @@ CHAIN_MAP = {
     # add more as needed
 }
 
+# Native-token placeholders and the zero address never have ERC-20 metadata
+_NON_TOKEN_SENTINELS = frozenset({"0x" + "e" * 40, "0x" + "0" * 40, ""})
+_EVM_ADDR_RE = re.compile(r"0x[0-9a-f]{40}")
+
+
+def _is_token_address(address: Optional[str]) -> bool:
+    """True for a well-formed, non-sentinel contract address (skip the RPC otherwise)."""
+    a = (address or "").lower()
+    return a not in _NON_TOKEN_SENTINELS and _EVM_ADDR_RE.fullmatch(a) is not None
+
+
 def _normalize_chain(chain: str) -> str:
     if not chain:
         return "eth"
     return CHAIN_MAP.get(chain.lower(), chain.lower())
 
 
-def _moralis_get(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def _moralis_url(endpoint: str) -> str:
+    # If full URL passed, use it; else construct v2 base url
+    if endpoint.lower().startswith("http"):
+        return endpoint
+    return f"https://deep-index.moralis.io/api/v2/{endpoint.lstrip('/')}"
+
+
+def _moralis_get(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 store: TTLCache = _cache) -> Dict[str, Any]:
     """Generic Moralis GET with caching and error handling.
     endpoint may be a relative path like 'address/{address}/transactions' or a full URL.
+    store picks the cache (and so the TTL) successful responses go to.
     """
-    key = get_moralis_api_key()
-    if not key:
+    if not get_moralis_api_key():
         return {"error": True, "reason": "no_api_key"}
 
-    # If full URL passed, use it; else construct v2 base url
-    if endpoint.lower().startswith("http"):
-        url = endpoint
-    else:
-        url = f"https://deep-index.moralis.io/api/v2/{endpoint.lstrip('/')}"
+    url = _moralis_url(endpoint)
     cache_key = f"moralis::{url}::{params}"
-    cached = _get_cache(cache_key)
+    cached = _get_cache(cache_key, store)
+    disk = _static_store() if store is _static_cache else None
+    if cached is None and disk is not None:
+        cached = disk.get(cache_key)
+        if cached is not None:
+            _set_cache(cache_key, cached, store)
+    if cached is None:
+        cached = _negative_cache.get(cache_key)
     if cached is not None:
         return cached
 
-    headers = {"Accept": "application/json", "X-API-Key": key}
+    # single-flight: concurrent callers for the same key wait on the first one's request
+    with _inflight_lock:
+        fut = _inflight.get(cache_key)
+        leader = fut is None
+        if leader:
+            fut = _inflight[cache_key] = Future()
+    if not leader:
+        return fut.result()
+
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        _set_cache(cache_key, data)
+        data, ok = _moralis_fetch(url, params)
+        if ok:
+            _set_cache(cache_key, data, store)
+            if disk is not None:
+                disk.set(cache_key, data, _STATIC_DISK_TTL)
+        else:
+            _negative_cache.set(cache_key, data, ttl=_failure_ttl(data))
+        fut.set_result(data)
         return data
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+
+def _failure_ttl(data: Dict[str, Any]) -> Optional[float]:
+    # None = _negative_cache's default TTL (a 4xx other than 429, or an unparseable body)
+    status = data.get("status")
+    if data.get("reason") == "json_decode_failed" or (status and 400 <= status < 500 and status != 429):
+        return None
+    return _TRANSIENT_FAILURE_TTL
+
+
+def _moralis_fetch(url: str, params: Optional[Dict[str, Any]]) -> tuple:
+    # (data, ok); ok responses go to the caller's cache, failures to _negative_cache.
+    # Auth header lives on _SESSION.
+    try:
+        r = _SESSION.get(url, params=params, timeout=10)
+        r.raise_for_status()
+        # bytes straight into the parser (no text decode); decode errors are ValueErrors
+        return _json_loads(r.content), True
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        return {"error": True, "reason": "request_failed", "status": status, "text": str(e)}, False
     except requests.RequestException as e:
-        return {"error": True, "reason": "request_failed", "text": str(e)}
+        return {"error": True, "reason": "request_failed", "text": str(e)}, False
     except ValueError:
-        return {"error": True, "reason": "json_decode_failed", "text": r.text if 'r' in locals() else ''}
+        return {"error": True, "reason": "json_decode_failed", "text": r.text if 'r' in locals() else ''}, False
 
 
 # --- High-level helpers used by scorer.py ---
@@ -92,8 +223,13 @@ def get_address_transactions(chain: str, address: str, limit: int = 50) -> Any:
         return {"error": True, "reason": "no_address"}
     ch = _normalize_chain(chain)
     endpoint = f"address/{address}/transactions"
-    params = {"chain": ch, "limit": limit}
-    return _moralis_get(endpoint, params=params)
+    bucket = next((b for b in _LIMIT_BUCKETS if limit <= b), limit)
+    params = {"chain": ch, "limit": bucket}
+    res = _moralis_get(endpoint, params=params)
+    # trim the shared bucket back to what this caller asked for
+    if bucket != limit and isinstance(res, dict) and isinstance(res.get("result"), list):
+        res = {**res, "result": res["result"][:limit]}
+    return res
 
 
 def get_address_balance(chain: str, address: str) -> Any:
@@ -116,25 +252,69 @@ def get_address_erc20(chain: str, address: str) -> Any:
 
 def get_token_metadata(chain: str, token_address: str) -> Any:
     """Return token metadata via Moralis (erc20/metadata endpoint)."""
-    if not token_address:
+    if not _is_token_address(token_address):
         return {}
     ch = _normalize_chain(chain)
     endpoint = "erc20/metadata"
     params = {"chain": ch, "addresses": token_address}
-    res = _moralis_get(endpoint, params=params)
+    res = _moralis_get(endpoint, params=params, store=_static_cache)
     # Moralis returns a list for metadata endpoint, try to normalize to dict
     if isinstance(res, list) and res:
         return res[0]
     return res
 
 
+# erc20/metadata accepts up to this many comma-separated addresses per call
+_METADATA_CHUNK = 25
+
+
+def get_token_metadata_bulk(chain: str, addresses: List[str]) -> Dict[str, Any]:
+    """Token metadata for many addresses, 25 per Moralis call.
+    Each result also fills the single-address cache slot get_token_metadata reads.
+    """
+    ch = _normalize_chain(chain)
+    url = _moralis_url("erc20/metadata")
+
+    def single_key(addr):
+        # the _moralis_get cache key of get_token_metadata(chain, addr)
+        params = {"chain": ch, "addresses": addr}
+        return f"moralis::{url}::{params}"
+
+    out: Dict[str, Any] = {}
+    missing = []
+    for addr in dict.fromkeys(a for a in addresses if _is_token_address(a)):
+        cached = _get_cache(single_key(addr), _static_cache)
+        if isinstance(cached, list) and cached:
+            out[addr] = cached[0]
+        else:
+            missing.append(addr)
+
+    disk = _static_store()
+    for i in range(0, len(missing), _METADATA_CHUNK):
+        chunk = missing[i:i + _METADATA_CHUNK]
+        res = _moralis_get("erc20/metadata", params={"chain": ch, "addresses": ",".join(chunk)})
+        if not isinstance(res, list):
+            continue
+        by_addr = {str(m.get("address", "")).lower(): m for m in res if isinstance(m, dict)}
+        for addr in chunk:
+            meta = by_addr.get(addr.lower())
+            if meta is None:
+                continue
+            out[addr] = meta
+            key = single_key(addr)
+            _set_cache(key, [meta], _static_cache)
+            if disk is not None:
+                disk.set(key, [meta], _STATIC_DISK_TTL)
+    return out
+
+
 def get_token_price(chain: str, token_address: str) -> float:
     """Return token price in USD when available."""
-    if not token_address:
+    if not _is_token_address(token_address):
         return 0.0
     ch = _normalize_chain(chain)
     endpoint = f"erc20/{token_address}/price"
-    res = _moralis_get(endpoint, params={"chain": ch})
+    res = _moralis_get(endpoint, params={"chain": ch}, store=_price_cache)
     if isinstance(res, dict):
         # Moralis variations: usdPrice or usd
         return float(res.get("usdPrice") or res.get("usd") or 0.0)
@@ -143,8 +323,49 @@ def get_token_price(chain: str, token_address: str) -> float:
 
 def get_contract_metadata(chain: str, contract_address: str) -> Any:
     """Try Moralis contract metadata endpoint; may vary by region/version."""
-    if not contract_address:
+    if not _is_token_address(contract_address):
         return {}
     ch = _normalize_chain(chain)
     endpoint = f"contract/{contract_address}/metadata"
-    return _moralis_get(endpoint, params={"chain": ch})
+    return _moralis_get(endpoint, params={"chain": ch}, store=_static_cache)
+
+
+# --- Async variants: independent lookups for one tx run concurrently ---
+
+async def aget_address_transactions(chain: str, address: str, limit: int = 50) -> Any:
+    return await asyncio.to_thread(get_address_transactions, chain, address, limit)
+
+
+async def aget_token_metadata(chain: str, token_address: str) -> Any:
+    return await asyncio.to_thread(get_token_metadata, chain, token_address)
+
+
+async def aget_token_price(chain: str, token_address: str) -> float:
+    return await asyncio.to_thread(get_token_price, chain, token_address)
+
+
+async def aget_contract_metadata(chain: str, contract_address: str) -> Any:
+    return await asyncio.to_thread(get_contract_metadata, chain, contract_address)
+
+
+async def afetch_tx_context(chain: str, from_addr: str, token_address: str = "", limit: int = 50) -> Dict[str, Any]:
+    """All Moralis lookups a tx needs, gathered so latency is the slowest call, not the sum.
+    A failed lookup comes back as an error dict instead of cancelling the others.
+    """
+    keys = ("transactions", "token_metadata", "token_price", "contract_metadata")
+    results = await asyncio.gather(
+        aget_address_transactions(chain, from_addr, limit),
+        aget_token_metadata(chain, token_address),
+        aget_token_price(chain, token_address),
+        aget_contract_metadata(chain, token_address),
+        return_exceptions=True,
+    )
+    return {
+        k: ({"error": True, "reason": "exception", "text": str(v)} if isinstance(v, Exception) else v)
+        for k, v in zip(keys, results)
+    }
+
+
+def get_tx_context(chain: str, from_addr: str, token_address: str = "", limit: int = 50) -> Dict[str, Any]:
+    """Sync facade over afetch_tx_context (not for use inside a running event loop)."""
+    return asyncio.run(afetch_tx_context(chain, from_addr, token_address, limit))
@@ -0,0 +1,38 @@
+# ============================================
+# CTRAD — UI Action Bands
+# ============================================
+
+from bisect import bisect_right
+
+from src.config import RISK_LABEL_CUTOFFS
+
+# (label, icon, color) per band; _CUTS are the lower bounds of WARN and BLOCK
+_BANDS = (
+    ("ALLOW", "✅", "#2ecc71"),
+    ("WARN", "⚠️", "#f1c40f"),
+    ("BLOCK", "❌", "#ff4b4b"),
+)
+_CUTS = RISK_LABEL_CUTOFFS
+
+# Badge markup is static per band, so build it once at import
+_BADGE_HTML = tuple(
+    f"""
+        <div style='background:{color};color:white;padding:12px;border-radius:8px;
+        width:160px;font-weight:bold;text-align:center'>
+        {icon} {label}
+        </div>
+        """
+    for label, icon, color in _BANDS
+)
+
+
+def band_index(score: float) -> int:
+    return bisect_right(_CUTS, score)
+
+
+def action_from_score(score: float):
+    return _BANDS[band_index(score)]
+
+
+def badge_html(score: float) -> str:
+    return _BADGE_HTML[band_index(score)]
@@ -0,0 +1,198 @@
+# ============================================
+# CTRAD — Streamlit Risk Widgets
+# ============================================
+
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from src.ui.actions import action_from_score, badge_html
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ------------------------------
+# SCORER PLACEHOLDER (Replace with real model)
+# ------------------------------
+
+# Since no real model yet → Fake but realistic output
+def fake_scorer(amount_usd: float) -> dict:
+    return {
+        "risk_score": 25,   # 0–100
+        "risk_label": "safe",
+        "component_scores": {
+            "rules": 0.0,
+            "tabular": 0.1,
+            "sequence": 0.0,
+            "graph": 0.0,
+            "contract": 0.0
+        },
+        "top_features": [
+            {"feature": "amount_usd", "value": amount_usd, "impact": 0.1}
+        ],
+        "reason_text": "Amount is normal. No high-risk patterns detected.",
+        "action": "allow"
+    }
+
+
+# ------------------------------
+# RISK METER
+# ------------------------------
+
+# ======== GAUGE HELPER ==========
+@st.cache_resource(max_entries=101)
+def _build_gauge(score_int: int):
+    # Cached per integer score so reruns reuse the same Figure object.
+    # Plotly is imported here so sessions that never open the gauge skip it.
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score_int,
+        number={'suffix': " /100", 'font': {'size': 28}},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {"range": [0, 30], "color": "#2ecc71"},
+                {"range": [30, 60], "color": "#f1c40f"},
+                {"range": [60, 100], "color": "#e74c3c"},
+            ],
+        }
+    ))
+    fig.update_layout(
+        height=320,
+        margin=dict(l=10, r=10, t=10, b=10),
+        template="none",
+        paper_bgcolor="white",
+        transition_duration=0
+    )
+    return fig
+
+
+def render_plotly_gauge(score: float):
+    value = max(0, min(100, float(score)))
+    try:
+        return _build_gauge(int(round(value)))
+    except ImportError:
+        return None
+
+
+def _toggle_gauge():
+    st.session_state["gauge_open"] = not st.session_state.get("gauge_open", False)
+
+
+def render_risk_bar(score: float):
+    # Plain HTML bar: no Plotly.js payload or figure serialization per rerun
+    value = max(0, min(100, float(score)))
+    _, _, color = action_from_score(value)
+    st.metric("Risk Score", f"{value:.0f} /100")
+    st.markdown(
+        f"""
+        <div style='background:#e0e0e0;border-radius:6px;height:18px;width:100%'>
+        <div style="width:{value}%;height:18px;border-radius:6px;
+        background:linear-gradient(90deg, #2ecc71, {color})"></div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+def render_risk_meter(score: float):
+    render_risk_bar(score)
+
+    if not st.session_state.get("use_plotly_gauge"):
+        return
+
+    with st.expander("Show risk gauge", expanded=st.session_state.get("gauge_open", False)):
+        gauge_open = st.session_state.get("gauge_open", False)
+        st.button(
+            "Hide gauge" if gauge_open else "Load gauge",
+            on_click=_toggle_gauge,
+            key="gauge_toggle"
+        )
+        if gauge_open:
+            fig = render_plotly_gauge(score)
+            if fig:
+                st.plotly_chart(
+                    fig,
+                    use_container_width=True,
+                    key="risk_gauge",
+                    config={"staticPlot": True, "displayModeBar": False}
+                )
+            else:
+                st.write("Plotly is not installed.")
+
+# ======== COMPONENT CARDS ==========
+def render_component_cards(component_scores: dict):
+    # One markdown element instead of st.columns + N st.metric widgets
+    cells = "".join(
+        f"<td style='text-align:center;padding:8px 16px'>"
+        f"{name.capitalize()}<br><span style='font-size:1.6em'>{int(val * 100)}%</span></td>"
+        for name, val in component_scores.items()
+    )
+    st.markdown(
+        f"<table style='width:100%'><tr>{cells}</tr></table>",
+        unsafe_allow_html=True
+    )
+
+# ======== FEATURE TABLE ==========
+@st.cache_data
+def _features_df(top_features_tuple: tuple):
+    # Tuple-of-tuples input keeps the cache key hashable
+    return pd.DataFrame(top_features_tuple, columns=["feature", "value", "impact"])
+
+# ------------------------------
+# RESULTS
+# ------------------------------
+
+@st.fragment
+def show_results(score_res: dict):
+    # Runs as a fragment: widgets in here (e.g. the gauge toggle) rerun
+    # only this section, not the whole input form
+    st.markdown("---")
+    st.header("🔍 Risk Analysis Result")
+
+    label = score_res.get("risk_label", "").upper()
+    risk_score = score_res.get("risk_score", 0)
+    comp_scores = score_res.get("component_scores", {})
+    top_features = score_res.get("top_features", [])
+    reason_text = score_res.get("reason_text", "")
+
+    st.write(f"**Label:** {label}")
+
+    render_risk_meter(risk_score)
+
+    # Action
+    st.markdown(badge_html(risk_score), unsafe_allow_html=True)
+
+    st.write(f"**Reason:** {reason_text}")
+
+    # Component Scores
+    st.subheader("Component Scores")
+    render_component_cards(comp_scores)
+
+    # Top Features
+    st.subheader("Top Contributing Features")
+    if top_features:
+        try:
+            df = _features_df(
+                tuple((f["feature"], f["value"], f["impact"]) for f in top_features)
+            )
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        except:
+            st.write(top_features)
+    else:
+        st.write("No feature explanations available.")
+
+    # History placeholder
+    st.subheader("Recent Flags / History")
+    st.write("History will appear here once DB/Cache is connected.")
+
+    # JSON
+    with st.expander("Full Scoring JSON"):
+        st.json(score_res)
+
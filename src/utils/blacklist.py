@@ -1,12 +1,11 @@
 # src/utils/blacklist.py
+from src.config import BLACKLIST
 
 
-BLACKLIST = {
-'0xscamdead00000000000000000000000000000000',
-'0xphishdead000000000000000000000000000000'
-}
+# Lowercased once at import; membership tests never re-normalize the set
+BLACKLIST_LC = frozenset(addr.lower() for addr in BLACKLIST)
 
 
 def load_blacklist():
-# In production, load from file, DB, or external service
-return set(addr.lower() for addr in BLACKLIST)
+    # In production, load from file, DB, or external service
+    return BLACKLIST_LC
@@ -0,0 +1,41 @@
+# src/utils/disk_cache.py
+# Persistent key/value cache on stdlib sqlite3, so results survive restarts.
+# Values are JSON-encoded; each entry carries its own expiry time.
+
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+
+class DiskCache:
+    def __init__(self, path: str):
+        path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value TEXT)"
+        )
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return default
+        return json.loads(row[1])
+
+    def set(self, key: str, val, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (key, time.time() + ttl, json.dumps(val)),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,16 @@
+# src/utils/jit.py
+# Optional Numba JIT: kernels decorated with njit run as plain Python
+# when numba isn't installed, so callers can check NUMBA_AVAILABLE and
+# prefer a NumPy path instead.
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Supports both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
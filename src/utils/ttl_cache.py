@@ -0,0 +1,41 @@
+# src/utils/ttl_cache.py
+# Small thread-safe TTL + LRU cache (stdlib only). Entries expire after
+# `ttl` seconds; once `maxsize` is reached the least recently used is evicted.
+
+import time
+from collections import OrderedDict
+from threading import RLock
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            rec = self._data.get(key)
+            if rec is None:
+                return default
+            expires, val = rec
+            if time.monotonic() >= expires:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return val
+
+    def set(self, key, val, ttl: float = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), val)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
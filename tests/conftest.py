@@ -0,0 +1,16 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def load_scoring_module(name: str):
+    # "src/scoring " has a trailing space, so it can't be imported as a package
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, ROOT / "src" / "scoring " / f"{name}.py")
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[name] = mod
+        spec.loader.exec_module(mod)
+    return sys.modules[name]
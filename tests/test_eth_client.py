@@ -0,0 +1,91 @@
+import conftest  # noqa: F401  (repo root on sys.path)
+from src.chain import eth_client
+from src.chain.eth_client import EthereumClient
+
+TOKEN = "0x" + "1" * 40
+OWNER = "0x" + "ab" * 20
+
+
+def _word(n):
+    return n.to_bytes(32, "big")
+
+
+def _abi_bytes(data):
+    # length-prefixed, right-padded to a 32-byte boundary
+    return _word(len(data)) + data + b"\x00" * (-len(data) % 32)
+
+
+def _aggregate3_result(results):
+    # ABI return of aggregate3: (bool success, bytes returnData)[]
+    tuples = [_word(int(ok)) + _word(0x40) + _abi_bytes(data) for ok, data in results]
+    offsets, pos = b"", 32 * len(tuples)
+    for t in tuples:
+        offsets += _word(pos)
+        pos += len(t)
+    return "0x" + (_word(0x20) + _word(len(tuples)) + offsets + b"".join(tuples)).hex()
+
+
+def _facts_client(monkeypatch, symbol, decimals, owner):
+    client = EthereumClient(api_key="test")
+    response = _aggregate3_result([symbol, decimals, owner])
+    monkeypatch.setattr(client, "eth_call", lambda to, data: response)
+    return client
+
+
+def test_encode_aggregate3_single_call():
+    encoded = eth_client._encode_aggregate3([(TOKEN, "0x95d89b41")])
+    expected = (
+        bytes.fromhex(eth_client._AGGREGATE3)
+        + _word(0x20) + _word(1) + _word(0x20)          # array offset, length, tuple offset
+        + _word(int(TOKEN, 16)) + _word(1) + _word(0x60)  # target, allowFailure, bytes offset
+        + _abi_bytes(bytes.fromhex("95d89b41"))
+    )
+    assert encoded == "0x" + expected.hex()
+
+
+def test_decode_aggregate3_round_trip():
+    symbol = _word(0x20) + _abi_bytes(b"USDC")
+    decoded = eth_client._decode_aggregate3(_aggregate3_result([(True, symbol), (False, b"")]))
+    assert decoded == [symbol, None]
+
+
+def test_decode_aggregate3_empty_result():
+    assert eth_client._decode_aggregate3("0x") == []
+
+
+def test_get_token_facts_string_symbol(monkeypatch):
+    client = _facts_client(
+        monkeypatch,
+        (True, _word(0x20) + _abi_bytes(b"USDC")),
+        (True, _word(6)),
+        (True, _word(int(OWNER, 16))),
+    )
+    assert client.get_token_facts(TOKEN) == {"symbol": "USDC", "decimals": 6, "owner": OWNER}
+
+
+def test_get_token_facts_bytes32_symbol_and_failed_owner(monkeypatch):
+    client = _facts_client(
+        monkeypatch,
+        (True, b"MKR".ljust(32, b"\x00")),
+        (True, _word(18)),
+        (False, b""),
+    )
+    assert client.get_token_facts(TOKEN) == {"symbol": "MKR", "decimals": 18, "owner": ""}
+
+
+def test_multicall3_falls_back_when_multicall_missing(monkeypatch):
+    client = EthereumClient(api_key="test")
+    calls = []
+
+    def fake_eth_call(to, data):
+        calls.append(to)
+        # chain without Multicall3: the aggregate call returns empty data
+        return "0x" if to == eth_client._MULTICALL3 else "0x" + "00" * 31 + "12"
+
+    monkeypatch.setattr(client, "eth_call", fake_eth_call)
+
+    facts = client.get_token_facts(TOKEN)
+
+    assert calls.count(eth_client._MULTICALL3) == 1
+    assert len(calls) == 4
+    assert facts["decimals"] == 18
@@ -0,0 +1,21 @@
+import pandas as pd
+
+import conftest  # noqa: F401  (repo root on sys.path)
+from src.features.feature_builder import FEATURE_NAMES, FeatureBuilder
+
+
+def test_transform_matches_transform_batch():
+    df = pd.DataFrame({
+        "amount_usd": [1.0, 3.5, 50_000.0],
+        "to_addr": ["0x1dead", "0x1", "0xabc"],
+        "token_contract": ["", "0xa", ""],
+    })
+    fb = FeatureBuilder()
+    assert (fb.transform(df).to_numpy() == fb.transform_batch(df.to_dict("records"))).all()
+
+
+def test_transform_without_optional_columns():
+    X = FeatureBuilder().transform(pd.DataFrame({"amount_usd": [10.0, None]}))
+    assert list(X.columns) == list(FEATURE_NAMES)
+    assert X["to_age_days"].tolist() == [120, 120]
+    assert X["is_contract_to"].tolist() == [0, 0]
@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import load_scoring_module
+
+scorer = load_scoring_module("scorer")
+
+
+class _OfflineEthClient:
+    # deterministic wallet facts, no network
+    def get_wallet_facts_batch(self, address):
+        return len(address) % 7, len(address) % 9
+
+
+@pytest.fixture
+def ctrad():
+    sc = scorer.CTRADScorer(shared=False)
+    sc.eth_client = _OfflineEthClient()
+    return sc
+
+
+def test_batch_matches_scalar_with_missing_keys(ctrad):
+    txs = [
+        {"from_addr": "0xabc1", "to_addr": "0x000a", "token_symbol": "eth", "amount_usd": 120_000,
+         "contract_addr": "0xdeadbeef", "contract_owner": "0xowner", "sell_tax": 30},
+        {"from_addr": "0x2", "token_symbol": "USDT", "amount_usd": 800,
+         "contract_addr": "0x1234"},
+        {"from_addr": "0x33", "to_addr": "0x1", "amount_usd": 26_000, "buy_tax": 20},
+        {"amount_usd": 10},
+    ]
+
+    expected = [ctrad.score_pre_transaction(dict(tx))["risk_score"] for tx in txs]
+
+    assert ctrad.score_batch(txs).tolist() == expected